@@ -33,12 +33,11 @@ from mscen.agents.conversation_memory import ConversationMemory
 from mscen.agents.feedback_learner import FeedbackLearner, FeedbackEntry
 from mscen.optimization.model_optimizer import ModelOptimizer
 from mscen.plugins.base import PluginManager
-from mscen.personalization.user_profile import PersonalizationEngine
-from mscen.ui.smart_components import SmartUI
+from mscen.ui.smart_components import SmartUI, get_personalization_engine
 from mscen.collaboration.sharing import SharingManager
 from datetime import datetime
 from mscen.ui.wizard import onboarding_wizard
-from mscen.tasks.queue import TaskQueue, TaskStatus
+from mscen.tasks.queue import TaskStatus
 from mscen.connectors.registry import BackendRegistry, BackendProfile
 from mscen.enterprise.license_server import LicenseServer
 from mscen.enterprise.security import SecurityManager, AccessContext
@@ -73,7 +72,7 @@ plugin_manager = PluginManager(BASE_DIR / "plugins", logger)
 model_optimizer = ModelOptimizer(logger, cache)
 
 # Personalization and collaboration
-personalization_engine = PersonalizationEngine(BASE_DIR / "user_profiles")
+personalization_engine = get_personalization_engine(BASE_DIR / "user_profiles")
 smart_ui = SmartUI(personalization_engine)
 sharing_manager = SharingManager(BASE_DIR / "shared")
 
@@ -735,7 +734,6 @@ with tab10:
 # Add Tasks tab at the end
 extra_tab = st.tabs(["📦 任务队列"])[0]
 with extra_tab:
-    tq = TaskQueue(BASE_DIR)
     def _submit_cb(t):
         logger.log({"event": "task.submitted", "id": t.id, "kind": t.kind})
     from mscen.ui.tasks_panel import tasks_panel
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_DATACLASS
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    # orjson always emits UTF-8 bytes (no ensure_ascii escaping)
+    option = _OPTS | orjson.OPT_INDENT_2 if indent else _OPTS
+    return orjson.dumps(obj, option=option)
+
+
+def loads(buf: bytes | str) -> Any:
+    return orjson.loads(buf)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    # Readers only ever see the old or the new file, never a partial write
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
@@ -2,7 +2,7 @@ import random
 from typing import Tuple
 from PIL import Image, ImageDraw
 
-from .utils.colors import palette_for_theme, horizontal_gradient
+from .utils.colors import palette_for_theme_np, horizontal_gradient
 
 
 def _draw_sleep(draw: ImageDraw.ImageDraw, width: int, height: int) -> None:
@@ -52,7 +52,7 @@ def _draw_thunder(draw: ImageDraw.ImageDraw, width: int, height: int) -> None:
 def generate_scene_image(theme: str, size: Tuple[int, int] = (768, 512), seed: int | None = 1234) -> Image.Image:
     if seed is not None:
         random.seed(seed)
-    palette = palette_for_theme(theme)
+    palette = palette_for_theme_np(theme)
     base = horizontal_gradient(size, palette)
     draw = ImageDraw.Draw(base)
     theme_l = theme.lower()
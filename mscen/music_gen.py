@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
 from typing import Tuple
 
 import numpy as np
 
-from .utils.audio import save_wav, mix_tracks
-from .utils.colors import palette_for_theme
+from .utils.audio import save_wav
+from .utils.colors import palette_for_theme_np
 
 
 SAMPLE_RATE = 22050
@@ -78,25 +79,33 @@ def generate_music_from_theme(theme: str, duration_s: float, out_dir: Path) -> P
     step_s = beat_s / 2.0
 
     times = np.arange(0.0, duration_s, step_s)
-    layers = []
+    # Notes cycle through the scale with a fixed length, so each distinct
+    # (freq, length) tone is synthesized once and summed straight into the mix
+    # in note order: the same float32 sums as mixing full-length layers
+    mix = np.zeros(n, dtype=np.float32)
+    tones = {}
     for idx, t0 in enumerate(times):
         degree = scale[idx % len(scale)]
         freq = base * (2 ** (degree / 12.0))
-        seg = _sine(freq, min(step_s * 1.9, duration_s - t0), amp=0.2)
+        seg_s = min(step_s * 1.9, duration_s - t0)
+        seg = tones.get((freq, seg_s))
+        if seg is None:
+            seg = tones[(freq, seg_s)] = _sine(freq, seg_s, amp=0.2)
         offset = int(t0 * SAMPLE_RATE)
-        lay = np.zeros(n, dtype=np.float32)
-        lay[offset : offset + seg.shape[0]] += seg
-        layers.append(lay)
+        mix[offset : offset + seg.shape[0]] += seg
 
     # Simple bass drone from palette darkness
-    palette = palette_for_theme(theme)
-    mean_brightness = np.mean([r + g + b for (r, g, b) in palette]) / (255 * 3)
+    palette = palette_for_theme_np(theme)
+    mean_brightness = palette.sum(axis=1).mean() / (255 * 3)
     bass_freq = 110 if mean_brightness < 0.5 else 147
     bass = _sine(bass_freq, duration_s, amp=0.12)
     bass = _pad_to(bass, n)
-    mix = mix_tracks(tuple(layers + [bass]))
+    mix += bass
+    mix *= 1.0 / max(1.0, float(len(times) + 1))
 
-    out_path = out_dir / f"music_{abs(hash((theme, duration_s))) % 10**8}.wav"
+    # blake2b rather than hash(): the name must not change between processes
+    tag = hashlib.blake2b(f"{theme}\0{duration_s!r}".encode("utf-8"), digest_size=8).hexdigest()
+    out_path = out_dir / f"music_{tag}.wav"
     return save_wav(mix, SAMPLE_RATE, out_path)
 
 
@@ -1,13 +1,41 @@
 from __future__ import annotations
 
-import json
-from datetime import datetime, timedelta
+import atexit
+import copy
+import heapq
+import statistics
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from typing import Dict, Any, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-import numpy as np
+from ..core import _json
+
+
+def _parse_ts(value: str) -> float:
+    """ISO timestamp -> epoch seconds; naive values are treated as UTC"""
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _migrate_usage_stats(usage_stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize persisted usage stats to their in-memory shapes"""
+    # favorite_themes is persisted as a sorted list, held as a set
+    usage_stats["favorite_themes"] = set(usage_stats.get("favorite_themes", ()))
+    # Fold the legacy `preferred_time_slots` hour list into `hour_histogram`
+    slots = usage_stats.pop("preferred_time_slots", None)
+    if "hour_histogram" not in usage_stats:
+        histogram = [0] * 24
+        for hour in slots or ():
+            histogram[int(hour) % 24] += 1
+        usage_stats["hour_histogram"] = histogram
+    return usage_stats
 
 
 @dataclass
@@ -18,6 +46,21 @@ class UserPreference:
     last_updated: str
     frequency: int = 1
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name == "last_updated":
+            # Cached epoch of last_updated (not a dataclass field, so never persisted)
+            object.__setattr__(self, "_ts", _parse_ts(value))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "category": self.category,
+            "value": self.value,
+            "confidence": self.confidence,
+            "last_updated": self.last_updated,
+            "frequency": self.frequency,
+        }
+
 
 @dataclass
 class UserProfile:
@@ -28,6 +71,15 @@ class UserProfile:
     quality_threshold: float = 0.8
     preferred_speed: str = "balanced"  # fast, balanced, quality
     notification_settings: Dict[str, bool] = None
+    # (category, value) -> preference, kept in sync with `preferences`
+    _index: Dict[Tuple[str, str], UserPreference] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Bumped on every mutation; keys derived-data caches
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    # (category, limit) -> top preferences, valid for `_ranked_version`
+    _ranked: Dict[Tuple[str, int], Tuple[UserPreference, ...]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _ranked_version: int = field(default=-1, init=False, repr=False, compare=False)
+    # Lower bound on the oldest preference's last_updated epoch
+    _oldest_ts: float = field(default=float("inf"), init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.notification_settings is None:
@@ -36,108 +88,162 @@ class UserProfile:
                 "recommendation_updates": True,
                 "system_updates": False
             }
+        self._index = {(p.category, p.value): p for p in self.preferences}
+        self._oldest_ts = min((p._ts for p in self.preferences), default=float("inf"))
 
 
 class PersonalizationEngine:
+    INSIGHT_CACHE_SIZE = 1024
+    FLUSH_INTERVAL = 0.5  # seconds between background profile writes
+
     def __init__(self, profiles_dir: Path) -> None:
         self.profiles_dir = profiles_dir
         self.profiles_dir.mkdir(parents=True, exist_ok=True)
         self.profiles: Dict[str, UserProfile] = {}
+        self._insight_cache: OrderedDict[Tuple[str, int, int], Dict[str, Any]] = OrderedDict()
+        self._dirty: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Held by mutators and while the flusher snapshots a payload, so a
+        # profile is never serialized halfway through an update
+        self._profile_lock = threading.RLock()
+        self._last_hash: Dict[str, int] = {}  # hash of the last payload written per user
+        # Background flusher, started by the first dirty mark and stopped by close()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = threading.Event()
         self._load_existing_profiles()
     
     def _load_existing_profiles(self) -> None:
         """Load existing user profiles from disk"""
-        for profile_file in self.profiles_dir.glob("*.json"):
+        paths = list(self.profiles_dir.glob("*.json"))
+        if not paths:
+            return
+
+        def _read(profile_file: Path) -> Tuple[Path, Any]:
             try:
-                with profile_file.open("r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    preferences = [UserPreference(**p) for p in data.get("preferences", [])]
-                    profile = UserProfile(
-                        user_id=data["user_id"],
-                        created_at=data["created_at"],
-                        preferences=preferences,
-                        usage_stats=data.get("usage_stats", {}),
-                        quality_threshold=data.get("quality_threshold", 0.8),
-                        preferred_speed=data.get("preferred_speed", "balanced"),
-                        notification_settings=data.get("notification_settings", {})
-                    )
-                    self.profiles[profile.user_id] = profile
-            except Exception as e:
+                return profile_file, _json.loads(profile_file.read_bytes())
+            except (OSError, ValueError) as e:
+                return profile_file, e
+
+        # Overlap file reads/parses; build profiles on this thread
+        with ThreadPoolExecutor(max_workers=min(32, len(paths))) as pool:
+            results = list(pool.map(_read, paths))
+
+        for profile_file, data in results:
+            if isinstance(data, Exception):
+                print(f"Failed to load profile {profile_file}: {data}")
+                continue
+            try:
+                preferences = [UserPreference(**p) for p in data.get("preferences", [])]
+                profile = UserProfile(
+                    user_id=data["user_id"],
+                    created_at=data["created_at"],
+                    preferences=preferences,
+                    usage_stats=_migrate_usage_stats(data.get("usage_stats", {})),
+                    quality_threshold=data.get("quality_threshold", 0.8),
+                    preferred_speed=data.get("preferred_speed", "balanced"),
+                    notification_settings=data.get("notification_settings", {})
+                )
+                self.profiles[profile.user_id] = profile
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
                 print(f"Failed to load profile {profile_file}: {e}")
     
     def get_or_create_profile(self, user_id: str) -> UserProfile:
         """Get existing profile or create new one"""
-        if user_id not in self.profiles:
+        profile = self.profiles.get(user_id)
+        if profile is not None:
+            return profile
+        with self._profile_lock:
+            if user_id in self.profiles:
+                return self.profiles[user_id]
             self.profiles[user_id] = UserProfile(
                 user_id=user_id,
                 created_at=datetime.utcnow().isoformat(),
                 preferences=[],
                 usage_stats={
                     "total_generations": 0,
-                    "favorite_themes": [],
+                    "favorite_themes": set(),
                     "avg_session_duration": 0,
-                    "preferred_time_slots": [],
+                    "hour_histogram": [0] * 24,
                     "device_preferences": {}
                 }
             )
             self._save_profile(user_id)
         return self.profiles[user_id]
     
-    def update_preference(self, user_id: str, category: str, value: str, confidence: float = 1.0) -> None:
+    def update_preference(self, user_id: str, category: str, value: str, confidence: float = 1.0,
+                          now_iso: Optional[str] = None) -> None:
         """Update user preference with learning"""
+        with self._profile_lock:
+            self._update_preference(user_id, category, value, confidence, now_iso)
+        self._save_profile(user_id)
+    
+    def _update_preference(self, user_id: str, category: str, value: str, confidence: float,
+                           now_iso: Optional[str]) -> None:
         profile = self.get_or_create_profile(user_id)
+        now_iso = now_iso or datetime.utcnow().isoformat()
         
-        # Find existing preference
-        existing_pref = None
-        for pref in profile.preferences:
-            if pref.category == category and pref.value == value:
-                existing_pref = pref
-                break
+        existing_pref = profile._index.get((category, value))
         
         if existing_pref:
             # Update existing preference
             existing_pref.frequency += 1
             existing_pref.confidence = min(1.0, existing_pref.confidence + 0.1)
-            existing_pref.last_updated = datetime.utcnow().isoformat()
+            existing_pref.last_updated = now_iso
         else:
             # Add new preference
             new_pref = UserPreference(
                 category=category,
                 value=value,
                 confidence=confidence,
-                last_updated=datetime.utcnow().isoformat()
+                last_updated=now_iso
             )
             profile.preferences.append(new_pref)
+            profile._index[(category, value)] = new_pref
+            profile._oldest_ts = min(profile._oldest_ts, new_pref._ts)
         
         # Decay old preferences
         self._decay_old_preferences(profile)
+        profile._version += 1
+    
+    def profile_version(self, user_id: str) -> int:
+        """Counter bumped on every change to the user's profile, for keying derived caches"""
+        return self.get_or_create_profile(user_id)._version
+    
+    def update_profile(self, user_id: str, **settings: Any) -> None:
+        """Set profile settings (e.g. preferred_speed, quality_threshold) and schedule a save"""
+        with self._profile_lock:
+            profile = self.get_or_create_profile(user_id)
+            for name, value in settings.items():
+                if name.startswith("_") or not hasattr(profile, name):
+                    raise AttributeError(f"UserProfile has no setting {name!r}")
+                setattr(profile, name, value)
+            profile._version += 1
         self._save_profile(user_id)
     
     def _decay_old_preferences(self, profile: UserProfile) -> None:
         """Decay confidence of old preferences"""
-        cutoff_date = datetime.utcnow() - timedelta(days=30)
+        cutoff_ts = time.time() - 30 * 86400
+        if profile._oldest_ts >= cutoff_ts:
+            return  # nothing old enough to decay
         
         for pref in profile.preferences:
-            last_updated = datetime.fromisoformat(pref.last_updated.replace('Z', '+00:00'))
-            if last_updated < cutoff_date:
+            if pref._ts < cutoff_ts:
                 pref.confidence *= 0.9  # Gradual decay
         
         # Remove very low confidence preferences
         profile.preferences = [p for p in profile.preferences if p.confidence > 0.1]
+        profile._index = {(p.category, p.value): p for p in profile.preferences}
+        profile._oldest_ts = min((p._ts for p in profile.preferences), default=float("inf"))
     
     def get_recommendations(self, user_id: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Generate personalized recommendations"""
         profile = self.get_or_create_profile(user_id)
         context = context or {}
         
-        # Analyze preferences by category
-        category_preferences = defaultdict(list)
-        for pref in profile.preferences:
-            category_preferences[pref.category].append(pref)
-        
         recommendations = {
-            "themes": self._recommend_themes(category_preferences, context),
-            "styles": self._recommend_styles(category_preferences, context),
+            "themes": self._recommend_themes(profile, context),
+            "styles": self._recommend_styles(profile, context),
             "parameters": self._recommend_parameters(profile, context),
             "workflows": self._recommend_workflows(profile, context),
             "optimization_settings": self._recommend_optimization(profile)
@@ -145,22 +251,30 @@ class PersonalizationEngine:
         
         return recommendations
     
-    def _recommend_themes(self, categories: Dict[str, List[UserPreference]], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _top_preferences(self, profile: UserProfile, category: str, limit: int) -> Tuple[UserPreference, ...]:
+        """Top preferences of a category by confidence * frequency, cached per profile version"""
+        if profile._ranked_version != profile._version:
+            profile._ranked.clear()
+            profile._ranked_version = profile._version
+        key = (category, limit)
+        top = profile._ranked.get(key)
+        if top is None:
+            prefs = [p for p in profile.preferences if p.category == category]
+            top = tuple(heapq.nlargest(limit, prefs, key=lambda p: p.confidence * p.frequency))
+            profile._ranked[key] = top
+        return top
+    
+    def _recommend_themes(self, profile: UserProfile, context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Recommend themes based on user history"""
-        theme_prefs = categories.get("theme", [])
-        if not theme_prefs:
+        top_themes = self._top_preferences(profile, "theme", 5)
+        if not top_themes:
             return [
                 {"theme": "现代简约", "confidence": 0.5, "reason": "通用推荐"},
                 {"theme": "温馨家居", "confidence": 0.5, "reason": "通用推荐"}
             ]
         
-        # Sort by confidence * frequency
-        sorted_themes = sorted(theme_prefs, 
-                             key=lambda p: p.confidence * p.frequency, 
-                             reverse=True)
-        
         recommendations = []
-        for pref in sorted_themes[:5]:
+        for pref in top_themes:
             recommendations.append({
                 "theme": pref.value,
                 "confidence": pref.confidence,
@@ -178,15 +292,13 @@ class PersonalizationEngine:
         
         return recommendations
     
-    def _recommend_styles(self, categories: Dict[str, List[UserPreference]], context: Dict[str, Any]) -> List[str]:
+    def _recommend_styles(self, profile: UserProfile, context: Dict[str, Any]) -> List[str]:
         """Recommend visual styles"""
-        style_prefs = categories.get("style", [])
-        if not style_prefs:
+        top_styles = self._top_preferences(profile, "style", 3)
+        if not top_styles:
             return ["现代", "简约", "温馨"]
         
-        return [p.value for p in sorted(style_prefs, 
-                                       key=lambda p: p.confidence * p.frequency, 
-                                       reverse=True)[:3]]
+        return [p.value for p in top_styles]
     
     def _recommend_parameters(self, profile: UserProfile, context: Dict[str, Any]) -> Dict[str, Any]:
         """Recommend generation parameters"""
@@ -210,9 +322,9 @@ class PersonalizationEngine:
         
         # Based on usage patterns
         usage = profile.usage_stats
-        favorite_themes = usage.get("favorite_themes", [])
+        favorite_themes = usage.get("favorite_themes", ())
         
-        if "派对" in str(favorite_themes):
+        if "派对" in favorite_themes:
             workflows.append({
                 "name": "派对专用流程",
                 "steps": ["音乐", "灯光", "视频"],
@@ -246,17 +358,25 @@ class PersonalizationEngine:
     
     def learn_from_interaction(self, user_id: str, interaction: Dict[str, Any]) -> None:
         """Learn from user interaction"""
+        with self._profile_lock:
+            self._learn_from_interaction(user_id, interaction)
+        self._save_profile(user_id)
+    
+    def _learn_from_interaction(self, user_id: str, interaction: Dict[str, Any]) -> None:
         profile = self.get_or_create_profile(user_id)
+        # One timestamp for every preference touched by this interaction
+        now_iso = datetime.utcnow().isoformat()
         
         # Extract preferences from interaction
         if "theme" in interaction:
-            self.update_preference(user_id, "theme", interaction["theme"])
+            self.update_preference(user_id, "theme", interaction["theme"], now_iso=now_iso)
+            profile.usage_stats.setdefault("favorite_themes", set()).add(interaction["theme"])
         
         if "rating" in interaction and interaction["rating"] >= 4:
             # High rating - reinforce preferences
             for key, value in interaction.items():
                 if key in ["style", "mood", "genre"]:
-                    self.update_preference(user_id, key, str(value), confidence=0.8)
+                    self.update_preference(user_id, key, str(value), confidence=0.8, now_iso=now_iso)
         
         # Update usage stats
         profile.usage_stats["total_generations"] = profile.usage_stats.get("total_generations", 0) + 1
@@ -268,13 +388,12 @@ class PersonalizationEngine:
             new_avg = (current_avg * (total - 1) + interaction["session_duration"]) / total
             profile.usage_stats["avg_session_duration"] = new_avg
         
-        # Track time preferences
+        # Track time preferences (interaction count per local hour)
         current_hour = datetime.now().hour
-        time_slots = profile.usage_stats.get("preferred_time_slots", [])
-        time_slots.append(current_hour)
-        profile.usage_stats["preferred_time_slots"] = time_slots[-50:]  # Keep last 50
+        histogram = profile.usage_stats.setdefault("hour_histogram", [0] * 24)
+        histogram[current_hour] += 1
         
-        self._save_profile(user_id)
+        profile._version += 1
     
     def get_adaptive_ui_config(self, user_id: str) -> Dict[str, Any]:
         """Get adaptive UI configuration"""
@@ -292,36 +411,96 @@ class PersonalizationEngine:
     
     def _get_top_themes(self, profile: UserProfile, limit: int = 5) -> List[str]:
         """Get top themes for quick access"""
-        theme_prefs = [p for p in profile.preferences if p.category == "theme"]
-        if not theme_prefs:
+        top_themes = self._top_preferences(profile, "theme", limit)
+        if not top_themes:
             return ["睡眠", "派对", "禅修", "浪漫", "圣诞节"]
         
-        sorted_themes = sorted(theme_prefs, 
-                             key=lambda p: p.confidence * p.frequency, 
-                             reverse=True)
-        return [p.value for p in sorted_themes[:limit]]
+        return [p.value for p in top_themes]
     
     def _save_profile(self, user_id: str) -> None:
+        """Mark profile for saving; bursts are coalesced by the background flusher"""
+        with self._dirty_lock:
+            self._dirty.add(user_id)
+            if self._flusher is None and not self._closed.is_set():
+                self._flusher = threading.Thread(target=self._flush_loop, name="profile-flusher", daemon=True)
+                self._flusher.start()
+                atexit.register(self.close)
+    
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Failed to flush profiles: {e}")
+    
+    def close(self) -> None:
+        """Stop the background flusher and write any pending changes"""
+        self._closed.set()
+        with self._dirty_lock:
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.join()
+            atexit.unregister(self.close)
+        self.flush()
+    
+    def flush(self) -> None:
+        """Write all pending profile changes to disk"""
+        with self._flush_lock:
+            with self._dirty_lock:
+                pending, self._dirty = self._dirty, set()
+            failed: List[str] = []
+            error: Optional[Exception] = None
+            for user_id in pending:
+                try:
+                    self._write_profile(user_id)
+                except Exception as e:
+                    failed.append(user_id)
+                    error = error or e
+            if failed:
+                # Keep failed profiles dirty so the next flush retries them
+                with self._dirty_lock:
+                    self._dirty.update(failed)
+                raise error
+    
+    def _write_profile(self, user_id: str) -> None:
         """Save user profile to disk"""
-        if user_id in self.profiles:
-            profile = self.profiles[user_id]
+        with self._profile_lock:
+            profile = self.profiles.get(user_id)
+            if profile is None:
+                return
             profile_data = {
                 "user_id": profile.user_id,
                 "created_at": profile.created_at,
-                "preferences": [asdict(p) for p in profile.preferences],
-                "usage_stats": profile.usage_stats,
+                "preferences": [p.to_dict() for p in profile.preferences],
+                "usage_stats": {
+                    **profile.usage_stats,
+                    "favorite_themes": sorted(profile.usage_stats.get("favorite_themes", ())),
+                },
                 "quality_threshold": profile.quality_threshold,
                 "preferred_speed": profile.preferred_speed,
                 "notification_settings": profile.notification_settings
             }
-            
-            profile_file = self.profiles_dir / f"{user_id}.json"
-            with profile_file.open("w", encoding="utf-8") as f:
-                json.dump(profile_data, f, ensure_ascii=False, indent=2)
+            # Serializing is the snapshot: mutators can't touch the profile meanwhile
+            payload = _json.dumps(profile_data, indent=True)
+        
+        payload_hash = hash(payload)
+        if self._last_hash.get(user_id) == payload_hash:
+            return  # identical to what is already on disk
+        
+        profile_file = self.profiles_dir / f"{user_id}.json"
+        _json.write_atomic(profile_file, payload)
+        self._last_hash[user_id] = payload_hash
     
     def export_insights(self, user_id: str) -> Dict[str, Any]:
         """Export user insights for analytics"""
         profile = self.get_or_create_profile(user_id)
+        # Retention figures change by day even when the profile does not
+        key = (user_id, profile._version, datetime.utcnow().toordinal())
+        cached = self._insight_cache.get(key)
+        if cached is not None:
+            self._insight_cache.move_to_end(key)
+            # Callers get their own copy; the cached dict must stay pristine
+            return copy.deepcopy(cached)
         
         insights = {
             "user_segment": self._classify_user_segment(profile),
@@ -331,7 +510,10 @@ class PersonalizationEngine:
             "growth_opportunities": self._identify_growth_opportunities(profile)
         }
         
-        return insights
+        self._insight_cache[key] = insights
+        if len(self._insight_cache) > self.INSIGHT_CACHE_SIZE:
+            self._insight_cache.popitem(last=False)
+        return copy.deepcopy(insights)
     
     def _classify_user_segment(self, profile: UserProfile) -> str:
         """Classify user into segments"""
@@ -352,7 +534,7 @@ class PersonalizationEngine:
         factors = {
             "frequency": min(1.0, profile.usage_stats.get("total_generations", 0) / 50),
             "session_length": min(1.0, profile.usage_stats.get("avg_session_duration", 0) / 600),
-            "preference_strength": np.mean([p.confidence for p in profile.preferences]) if profile.preferences else 0,
+            "preference_strength": statistics.fmean(p.confidence for p in profile.preferences) if profile.preferences else 0,
             "feature_adoption": len(set(p.category for p in profile.preferences)) / 10
         }
         
@@ -371,7 +553,7 @@ class PersonalizationEngine:
                 values_per_category[pref.category] = set()
             values_per_category[pref.category].add(pref.value)
         
-        avg_values_per_category = np.mean([len(values) for values in values_per_category.values()])
+        avg_values_per_category = statistics.fmean(len(values) for values in values_per_category.values())
         return min(1.0, avg_values_per_category / 5)  # Normalize
     
     def _get_loyalty_indicators(self, profile: UserProfile) -> Dict[str, Any]:
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Tuple
 
+import numpy as np
+
+from ..core import _json
 from ..lighting import generate_lighting_from_theme
 
 
@@ -25,28 +28,48 @@ class Project:
         return {
             "name": self.name,
             "theme": self.theme,
-            "rooms": [asdict(r) for r in self.rooms],
+            "rooms": [{"name": r.name, "brightness": r.brightness, "delay_ms": r.delay_ms} for r in self.rooms],
         }
 
 
-def _apply_brightness(frames: List[Dict[str, int]], brightness: float) -> List[Dict[str, int]]:
+def _frames_to_array(frames: List[Dict[str, int]]) -> np.ndarray:
+    n = len(frames)
+    return np.fromiter(
+        (v for f in frames for v in (f["r"], f["g"], f["b"], f["ms"])), dtype=np.float64, count=4 * n
+    ).reshape(n, 4)
+
+
+def _scale_frames(arr: np.ndarray, brightness: float) -> List[Tuple[int, int, int, int]]:
     b = max(0.0, min(1.0, float(brightness)))
-    out: List[Dict[str, int]] = []
-    for f in frames:
-        out.append({
-            "r": max(0, min(255, int(f["r"] * b))),
-            "g": max(0, min(255, int(f["g"] * b))),
-            "b": max(0, min(255, int(f["b"] * b))),
-            "ms": int(f["ms"]),
-        })
-    return out
+    out = np.empty(arr.shape, dtype=np.int64)
+    out[:, :3] = np.clip((arr[:, :3] * b).astype(np.int64), 0, 255)
+    out[:, 3] = arr[:, 3]
+    return [tuple(row) for row in out.tolist()]
+
+
+def _apply_brightness(frames: List[Dict[str, int]], brightness: float) -> List[Dict[str, int]]:
+    scaled = _scale_frames(_frames_to_array(frames), brightness)
+    return [{"r": r, "g": g, "b": b, "ms": ms} for r, g, b, ms in scaled]
+
+
+@lru_cache(maxsize=64)
+def _theme_frames(theme: str) -> np.ndarray:
+    arr = _frames_to_array(generate_lighting_from_theme(theme))
+    arr.flags.writeable = False
+    return arr
+
+
+@lru_cache(maxsize=256)
+def _room_frames(theme: str, brightness_q: int) -> Tuple[Tuple[int, int, int, int], ...]:
+    # brightness_q is brightness in thousandths so rooms with equal levels share one entry
+    return tuple(_scale_frames(_theme_frames(theme), brightness_q / 1000))
 
 
 def compile_project(proj: Project) -> Dict[str, List[Dict[str, int]]]:
-    base_frames = generate_lighting_from_theme(proj.theme)
     per_room: Dict[str, List[Dict[str, int]]] = {}
     for room in proj.rooms:
-        frames = _apply_brightness(base_frames, room.brightness)
+        scaled = _room_frames(proj.theme, round(float(room.brightness) * 1000))
+        frames = [{"r": r, "g": g, "b": b, "ms": ms} for r, g, b, ms in scaled]
         if room.delay_ms > 0:
             # Insert an initial black frame to represent delay
             per_room[room.name] = [{"r": 0, "g": 0, "b": 0, "ms": int(room.delay_ms)}] + frames
@@ -58,8 +81,7 @@ def compile_project(proj: Project) -> Dict[str, List[Dict[str, int]]]:
 def save_project(proj: Project, out_dir: Path) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
     path = out_dir / f"project_{proj.name}.json"
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(proj.to_dict(), f, ensure_ascii=False, indent=2)
+    _json.write_atomic(path, _json.dumps(proj.to_dict(), indent=True))
     return path
 
 
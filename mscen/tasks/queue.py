@@ -1,19 +1,35 @@
 from __future__ import annotations
 
-import json
-import uuid
-from dataclasses import dataclass, asdict
-from enum import Enum
+import threading
+from dataclasses import dataclass
+from enum import IntEnum
 from pathlib import Path
 from typing import Any, Dict, Optional, List
 
+from ..core import _json
+from ..utils.idpool import next_uuid
 
-class TaskStatus(str, Enum):
-    PENDING = "pending"
-    RUNNING = "running"
-    PAUSED = "paused"
-    FAILED = "failed"
-    COMPLETED = "completed"
+
+class TaskStatus(IntEnum):
+    PENDING = 0
+    RUNNING = 1
+    PAUSED = 2
+    FAILED = 3
+    COMPLETED = 4
+
+    @property
+    def label(self) -> str:
+        return _STATUS_NAMES[self]
+
+
+# String form of each status, indexed by value (also the pre-IntEnum on-disk form)
+_STATUS_NAMES = ("pending", "running", "paused", "failed", "completed")
+
+
+def _coerce_status(value: Any) -> TaskStatus:
+    if isinstance(value, str):
+        return TaskStatus(_STATUS_NAMES.index(value))
+    return TaskStatus(value)
 
 
 @dataclass
@@ -27,65 +43,113 @@ class Task:
 
 
 class TaskQueue:
+    # Rewrite the log once it holds this many records per live task
+    COMPACT_FACTOR = 4
+
     def __init__(self, base_dir: Path) -> None:
         self.base_dir = base_dir
         self.state_file = base_dir / "tasks" / "queue.jsonl"
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
         self.tasks: Dict[str, Task] = {}
+        self._records = 0
+        self._seen_stat: Optional[tuple] = None
+        # One queue may be shared by several sessions/threads (the UI caches it
+        # process-wide): mutators, reloads and listings all hold this lock
+        self._lock = threading.RLock()
         self._load()
 
+    def _stat(self) -> Optional[tuple]:
+        try:
+            info = self.state_file.stat()
+        except FileNotFoundError:
+            return None
+        return (info.st_ino, info.st_mtime_ns, info.st_size)
+
+    def refresh(self) -> None:
+        """Reload from disk only if the log changed since this instance last touched it"""
+        with self._lock:
+            if self._stat() != self._seen_stat:
+                self.tasks.clear()
+                self._records = 0
+                self._load()
+
     def _load(self) -> None:
-        if not self.state_file.exists():
+        self._seen_stat = self._stat()
+        if self._seen_stat is None:
             return
-        for line in self.state_file.read_text(encoding="utf-8").splitlines():
-            try:
-                data = json.loads(line)
-                self.tasks[data["id"]] = Task(**data)
-            except Exception:
-                continue
-
-    def _persist(self) -> None:
-        with self.state_file.open("w", encoding="utf-8") as f:
-            for t in self.tasks.values():
-                f.write(json.dumps(asdict(t), ensure_ascii=False) + "\n")
+        with self.state_file.open("rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                self._records += 1
+                try:
+                    data = _json.loads(line)
+                    if "status" in data:
+                        data["status"] = _coerce_status(data["status"])
+                    # Later records for the same id supersede earlier ones
+                    self.tasks[data["id"]] = Task(**data)
+                except Exception:
+                    continue
+
+    def _append(self, task: Task) -> None:
+        # Callers hold self._lock
+        with self.state_file.open("ab") as f:
+            f.write(_json.dumps(task) + b"\n")
+        self._seen_stat = self._stat()
+        self._records += 1
+        if self._records > self.COMPACT_FACTOR * len(self.tasks):
+            self.compact()
+
+    def compact(self) -> None:
+        with self._lock:
+            data = b"".join(_json.dumps(t) + b"\n" for t in self.tasks.values())
+            _json.write_atomic(self.state_file, data)
+            self._seen_stat = self._stat()
+            self._records = len(self.tasks)
 
     def submit(self, kind: str, params: Dict[str, Any]) -> Task:
-        tid = str(uuid.uuid4())[:8]
+        tid = next_uuid()[:8]
         task = Task(id=tid, kind=kind, params=params)
-        self.tasks[tid] = task
-        self._persist()
+        with self._lock:
+            self.tasks[tid] = task
+            self._append(task)
         return task
 
     def pause(self, task_id: str) -> None:
-        t = self.tasks.get(task_id)
-        if t and t.status == TaskStatus.RUNNING:
-            t.status = TaskStatus.PAUSED
-            self._persist()
+        with self._lock:
+            t = self.tasks.get(task_id)
+            if t and t.status == TaskStatus.RUNNING:
+                t.status = TaskStatus.PAUSED
+                self._append(t)
 
     def resume(self, task_id: str) -> None:
-        t = self.tasks.get(task_id)
-        if t and t.status in (TaskStatus.PAUSED, TaskStatus.FAILED):
-            t.status = TaskStatus.PENDING
-            t.error = None
-            self._persist()
+        with self._lock:
+            t = self.tasks.get(task_id)
+            if t and t.status in (TaskStatus.PAUSED, TaskStatus.FAILED):
+                t.status = TaskStatus.PENDING
+                t.error = None
+                self._append(t)
 
     def retry(self, task_id: str) -> None:
         self.resume(task_id)
 
     def update(self, task_id: str, *, status: Optional[TaskStatus] = None, progress: Optional[float] = None, error: Optional[str] = None) -> None:
-        t = self.tasks.get(task_id)
-        if not t:
-            return
-        if status is not None:
-            t.status = status
-        if progress is not None:
-            t.progress = progress
-        if error is not None:
-            t.error = error
-        self._persist()
+        with self._lock:
+            t = self.tasks.get(task_id)
+            if not t:
+                return
+            if status is not None:
+                t.status = status
+            if progress is not None:
+                t.progress = progress
+            if error is not None:
+                t.error = error
+            self._append(t)
 
     def list(self) -> List[Task]:
-        return list(self.tasks.values())
+        with self._lock:
+            return list(self.tasks.values())
 
     def get(self, task_id: str) -> Optional[Task]:
-        return self.tasks.get(task_id) 
\ No newline at end of file
+        with self._lock:
+            return self.tasks.get(task_id) 
\ No newline at end of file
@@ -4,6 +4,75 @@ from typing import Dict, Any, List, Optional, Callable
 import streamlit as st
 from pathlib import Path
 
+from ..personalization.user_profile import PersonalizationEngine
+from ..utils.idpool import next_uuid
+
+
+@st.cache_resource
+def get_personalization_engine(profiles_dir: Path) -> PersonalizationEngine:
+    """The process-wide engine: one profile flusher for every session and rerun
+
+    The engine is never released, so it stays open for the life of the
+    process; its atexit hook closes it and flushes pending profiles.
+    """
+    return PersonalizationEngine(profiles_dir)
+
+
+# Engine-derived data cached across reruns. `version` is the profile's
+# mutation counter, so any learned interaction invalidates the entry;
+# the leading underscore keeps the engine itself out of the cache key.
+@st.cache_data(ttl=60)
+def _cached_recommendations(_engine: PersonalizationEngine, user_id: str, version: int) -> Dict[str, Any]:
+    return _engine.get_recommendations(user_id)
+
+
+@st.cache_data(ttl=60)
+def _cached_ui_config(_engine: PersonalizationEngine, user_id: str, version: int) -> Dict[str, Any]:
+    return _engine.get_adaptive_ui_config(user_id)
+
+
+@st.cache_data(ttl=60)
+def _cached_insights(_engine: PersonalizationEngine, user_id: str, version: int) -> Dict[str, Any]:
+    return _engine.export_insights(user_id)
+
+
+@st.cache_data(ttl=60)
+def _cached_opportunities(_engine: PersonalizationEngine, user_id: str, version: int) -> List[str]:
+    return _engine._identify_growth_opportunities(_engine.get_or_create_profile(user_id))
+
+
+# User-friendly error messages
+_FRIENDLY_MESSAGES = {
+    "ConnectionError": "🌐 网络连接问题，请检查网络设置",
+    "TimeoutError": "⏰ 请求超时，服务器可能繁忙，请稍后重试",
+    "FileNotFoundError": "📁 文件未找到，请检查文件路径",
+    "ValueError": "❗ 输入参数有误，请检查输入内容",
+    "RuntimeError": "⚠️ 运行时错误，请尝试调整参数重新生成"
+}
+
+_ERROR_SUGGESTIONS = {
+    "ConnectionError": (
+        "检查网络连接是否正常",
+        "确认服务器地址配置正确",
+        "尝试使用本地生成模式"
+    ),
+    "TimeoutError": (
+        "降低生成质量设置以减少处理时间",
+        "稍后重试，避开服务器繁忙时段",
+        "检查网络稳定性"
+    ),
+    "ValueError": (
+        "检查输入文本是否包含特殊字符",
+        "确认参数值在有效范围内",
+        "尝试使用默认参数设置"
+    ),
+    "RuntimeError": (
+        "尝试重新启动应用程序",
+        "清理缓存文件后重试",
+        "检查系统资源是否充足"
+    ),
+}
+
 
 class SmartUI:
     def __init__(self, personalization_engine=None):
@@ -13,14 +82,16 @@ class SmartUI:
     def _get_user_id(self) -> str:
         """Get or create user ID for session"""
         if "user_id" not in st.session_state:
-            import uuid
-            st.session_state.user_id = str(uuid.uuid4())[:8]
+            st.session_state.user_id = next_uuid()[:8]
         return st.session_state.user_id
     
+    def _profile_version(self) -> int:
+        return self.personalization_engine.profile_version(self.user_id)
+    
     def smart_theme_selector(self, key: str = "theme") -> str:
         """Smart theme selector with personalized recommendations"""
         if self.personalization_engine:
-            recommendations = self.personalization_engine.get_recommendations(self.user_id)
+            recommendations = _cached_recommendations(self.personalization_engine, self.user_id, self._profile_version())
             suggested_themes = [r["theme"] for r in recommendations.get("themes", [])]
             
             if suggested_themes:
@@ -50,7 +121,7 @@ class SmartUI:
         
         # Show frequently used themes first
         if self.personalization_engine:
-            config = self.personalization_engine.get_adaptive_ui_config(self.user_id)
+            config = _cached_ui_config(self.personalization_engine, self.user_id, self._profile_version())
             quick_themes = config.get("quick_access_themes", [])
             if quick_themes:
                 st.markdown("**⚡ 常用主题**")
@@ -72,7 +143,7 @@ class SmartUI:
         # Get user config
         show_advanced = False
         if self.personalization_engine:
-            config = self.personalization_engine.get_adaptive_ui_config(self.user_id)
+            config = _cached_ui_config(self.personalization_engine, self.user_id, self._profile_version())
             show_advanced = config.get("show_advanced_options", False)
         
         if not show_advanced:
@@ -140,16 +211,7 @@ class SmartUI:
         error_type = type(error).__name__
         error_msg = str(error)
         
-        # User-friendly error messages
-        friendly_messages = {
-            "ConnectionError": "🌐 网络连接问题，请检查网络设置",
-            "TimeoutError": "⏰ 请求超时，服务器可能繁忙，请稍后重试",
-            "FileNotFoundError": "📁 文件未找到，请检查文件路径",
-            "ValueError": "❗ 输入参数有误，请检查输入内容",
-            "RuntimeError": "⚠️ 运行时错误，请尝试调整参数重新生成"
-        }
-        
-        friendly_msg = friendly_messages.get(error_type, f"❌ 发生错误: {error_msg}")
+        friendly_msg = _FRIENDLY_MESSAGES.get(error_type, f"❌ 发生错误: {error_msg}")
         
         with st.error(friendly_msg):
             # Error details in expander
@@ -161,45 +223,15 @@ class SmartUI:
             # Suggestions
             suggestions = self._get_error_suggestions(error_type, context)
             if suggestions:
-                st.markdown("**💡 建议解决方案:**")
-                for suggestion in suggestions:
-                    st.markdown(f"• {suggestion}")
+                st.markdown("\n\n".join(["**💡 建议解决方案:**"] + [f"• {s}" for s in suggestions]))
     
     def _get_error_suggestions(self, error_type: str, context: Dict[str, Any] = None) -> List[str]:
         """Get contextual error suggestions"""
-        suggestions = []
-        
-        if error_type == "ConnectionError":
-            suggestions = [
-                "检查网络连接是否正常",
-                "确认服务器地址配置正确",
-                "尝试使用本地生成模式"
-            ]
-        elif error_type == "TimeoutError":
-            suggestions = [
-                "降低生成质量设置以减少处理时间",
-                "稍后重试，避开服务器繁忙时段",
-                "检查网络稳定性"
-            ]
-        elif error_type == "ValueError":
-            suggestions = [
-                "检查输入文本是否包含特殊字符",
-                "确认参数值在有效范围内",
-                "尝试使用默认参数设置"
-            ]
-        elif error_type == "RuntimeError":
-            suggestions = [
-                "尝试重新启动应用程序",
-                "清理缓存文件后重试",
-                "检查系统资源是否充足"
-            ]
-        
-        return suggestions
+        return list(_ERROR_SUGGESTIONS.get(error_type, ()))
     
     def feedback_collector(self, result_data: Dict[str, Any], key: str = "feedback") -> Optional[Dict[str, Any]]:
         """Collect user feedback on results"""
-        st.markdown("---")
-        st.markdown("**📝 您的反馈很重要**")
+        st.markdown("---\n\n**📝 您的反馈很重要**")
         
         col1, col2 = st.columns([2, 1])
         
@@ -280,8 +312,7 @@ class SmartUI:
                 ("🤖 AI 助手", "智能规划和个性化推荐")
             ]
             
-            for feature, desc in features:
-                st.markdown(f"**{feature}**: {desc}")
+            st.markdown("\n\n".join(f"**{feature}**: {desc}" for feature, desc in features))
             
             if st.button("下一步：设置偏好", key="onboarding_next_0"):
                 st.session_state.onboarding_step = 1
@@ -329,9 +360,11 @@ class SmartUI:
                         for theme in preferred_themes:
                             self.personalization_engine.update_preference(self.user_id, "theme", theme, 0.8)
                         
-                        profile = self.personalization_engine.get_or_create_profile(self.user_id)
-                        profile.preferred_speed = {"速度优先": "fast", "平衡": "balanced", "质量优先": "quality"}[quality_preference]
-                        profile.quality_threshold = {"速度优先": 0.6, "平衡": 0.8, "质量优先": 0.9}[quality_preference]
+                        self.personalization_engine.update_profile(
+                            self.user_id,
+                            preferred_speed={"速度优先": "fast", "平衡": "balanced", "质量优先": "quality"}[quality_preference],
+                            quality_threshold={"速度优先": 0.6, "平衡": 0.8, "质量优先": 0.9}[quality_preference],
+                        )
                     
                     st.session_state.onboarding_step = 2
                     st.rerun()
@@ -350,10 +383,12 @@ class SmartUI:
                 with st.spinner("正在为您生成..."):
                     # Mock generation
                     st.success("🎉 生成完成！")
-                    st.markdown("这就是您的第一个 AI 创作作品。您可以:")
-                    st.markdown("• 调整参数重新生成")
-                    st.markdown("• 下载保存到本地")
-                    st.markdown("• 发送到智能设备")
+                    st.markdown(
+                        "这就是您的第一个 AI 创作作品。您可以:\n\n"
+                        "• 调整参数重新生成\n\n"
+                        "• 下载保存到本地\n\n"
+                        "• 发送到智能设备"
+                    )
                     
                     col5, col6 = st.columns(2)
                     with col5:
@@ -365,14 +400,15 @@ class SmartUI:
                             st.rerun()
         
         elif current_step == 3:
-            st.markdown("### 🏁 设置完成")
-            st.markdown("🎊 恭喜！您已经掌握了基本使用方法。")
-            
-            st.markdown("**接下来您可以：**")
-            st.markdown("• 📱 在各个功能页签中探索更多能力")
-            st.markdown("• ⚙️ 在设置中连接您的智能设备")
-            st.markdown("• 💡 查看个性化推荐获得灵感")
-            st.markdown("• 🔄 通过反馈帮助我们改进")
+            st.markdown(
+                "### 🏁 设置完成\n\n"
+                "🎊 恭喜！您已经掌握了基本使用方法。\n\n"
+                "**接下来您可以：**\n\n"
+                "• 📱 在各个功能页签中探索更多能力\n\n"
+                "• ⚙️ 在设置中连接您的智能设备\n\n"
+                "• 💡 查看个性化推荐获得灵感\n\n"
+                "• 🔄 通过反馈帮助我们改进"
+            )
             
             if st.button("开始使用", key="onboarding_complete"):
                 st.session_state.onboarding_completed = True
@@ -384,8 +420,7 @@ class SmartUI:
     def smart_tips_panel(self) -> None:
         """Context-aware tips panel"""
         if self.personalization_engine:
-            profile = self.personalization_engine.get_or_create_profile(self.user_id)
-            opportunities = self.personalization_engine._identify_growth_opportunities(profile)
+            opportunities = _cached_opportunities(self.personalization_engine, self.user_id, self._profile_version())
             
             if opportunities:
                 with st.sidebar:
@@ -399,7 +434,7 @@ class SmartUI:
             return
         
         profile = self.personalization_engine.get_or_create_profile(self.user_id)
-        insights = self.personalization_engine.export_insights(self.user_id)
+        insights = _cached_insights(self.personalization_engine, self.user_id, self._profile_version())
         
         with st.expander("📊 我的创作统计"):
             col1, col2, col3 = st.columns(3)
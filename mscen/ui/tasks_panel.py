@@ -5,9 +5,15 @@ from pathlib import Path
 from ..tasks.queue import TaskQueue, TaskStatus
 
 
+@st.cache_resource
+def _get_task_queue(base_dir_str: str) -> TaskQueue:
+    return TaskQueue(Path(base_dir_str))
+
+
 def tasks_panel(base_dir: Path, submit_cb):
     st.markdown("### 📦 任务队列")
-    tq = TaskQueue(base_dir)
+    tq = _get_task_queue(str(base_dir))
+    tq.refresh()
 
     with st.expander("提交新任务"):
         col1, col2 = st.columns(2)
@@ -28,16 +34,21 @@ def tasks_panel(base_dir: Path, submit_cb):
         return
 
     for t in tasks:
-        with st.container(border=True):
-            st.write(f"ID: {t.id} | 类型: {t.kind}")
-            st.progress(t.progress)
-            cols = st.columns(5)
-            cols[0].metric("状态", t.status)
-            cols[1].metric("进度", f"{int(t.progress*100)}%")
-            cols[2].metric("错误", t.error or "-")
-            if cols[3].button("暂停", key=f"pause_{t.id}"):
-                tq.pause(t.id)
-                st.rerun()
-            if cols[4].button("恢复/重试", key=f"resume_{t.id}"):
-                tq.resume(t.id)
-                st.rerun() 
\ No newline at end of file
+        _render_task(tq, t.id)
+
+
+@st.fragment
+def _render_task(tq: TaskQueue, task_id: str):
+    # Pause/resume clicks rerun only this card; callbacks mutate the queue before it re-renders
+    t = tq.get(task_id)
+    if t is None:
+        return
+    with st.container(border=True):
+        st.markdown(
+            f"ID: {t.id} | 类型: {t.kind}  \n"
+            f"**状态** {t.status.label} · **进度** {int(t.progress*100)}% · **错误** {t.error or '-'}"
+        )
+        st.progress(t.progress)
+        cols = st.columns(2)
+        cols[0].button("暂停", key=f"pause_{t.id}", on_click=tq.pause, args=(t.id,))
+        cols[1].button("恢复/重试", key=f"resume_{t.id}", on_click=tq.resume, args=(t.id,))
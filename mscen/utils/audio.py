@@ -1,45 +1,57 @@
+import wave
 from pathlib import Path
-from typing import Tuple
 
 import numpy as np
-from scipy.io import wavfile
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 
 def ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _scale_to_int16(a, scale, out):
+        # Scale, clip and truncate in one pass, no float temporaries
+        for i in prange(a.size):
+            v = a[i] * scale
+            if v > 32767.0:
+                v = 32767.0
+            elif v < -32768.0:
+                v = -32768.0
+            out[i] = np.int16(v)
+
+
 def normalize_to_int16(audio: np.ndarray) -> np.ndarray:
     if audio.size == 0:
         return np.zeros(0, dtype=np.int16)
-    max_val = float(np.max(np.abs(audio)))
+    if audio.dtype == np.int16:
+        return audio  # already PCM16, keep levels as produced
+    # max(|x|) without materializing np.abs(audio)
+    max_val = max(float(audio.max()), -float(audio.min()))
     if max_val < 1e-9:
         return np.zeros_like(audio, dtype=np.int16)
-    scaled = audio / max_val
-    return np.clip(scaled * 32767.0, -32768.0, 32767.0).astype(np.int16)
+    if NUMBA_AVAILABLE:
+        out = np.empty(audio.shape, dtype=np.int16)
+        _scale_to_int16(np.ascontiguousarray(audio).reshape(-1), 32767.0 / max_val, out.reshape(-1))
+        return out
+    # Fold the peak division into the int16 scale factor: one multiply pass
+    scaled = audio * (32767.0 / max_val)
+    return np.clip(scaled, -32768.0, 32767.0, out=scaled).astype(np.int16)
 
 
 def save_wav(audio: np.ndarray, sample_rate: int, out_path: Path) -> Path:
     ensure_parent(out_path)
-    data = normalize_to_int16(audio)
-    wavfile.write(out_path, sample_rate, data)
+    data = np.ascontiguousarray(normalize_to_int16(audio), dtype="<i2")
+    with wave.open(str(out_path), "wb") as wf:
+        wf.setnchannels(1 if data.ndim == 1 else data.shape[1])
+        wf.setsampwidth(2)
+        wf.setframerate(int(sample_rate))
+        # Hand the int16 buffer to the file without a bytes copy
+        wf.writeframes(memoryview(data).cast("B"))
     return out_path
-
-
-def mix_tracks(tracks: Tuple[np.ndarray, ...]) -> np.ndarray:
-    if not tracks:
-        return np.array([], dtype=np.float32)
-    max_len = max(track.shape[0] for track in tracks)
-    mix = np.zeros(max_len, dtype=np.float32)
-    for t in tracks:
-        if t.shape[0] < max_len:
-            padded = np.zeros(max_len, dtype=np.float32)
-            padded[: t.shape[0]] = t.astype(np.float32)
-            mix += padded
-        else:
-            mix += t[:max_len].astype(np.float32)
-    mix /= max(1.0, float(len(tracks)))
-    return mix
-
-
-
@@ -1,4 +1,7 @@
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
 from PIL import Image
 
 
@@ -21,14 +24,43 @@ THEME_TO_PALETTE = {
 }
 
 
-def palette_for_theme(theme: str) -> Palette:
+DEFAULT_PALETTE: Palette = [(40, 40, 40), (90, 90, 90), (160, 160, 160)]
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+# (n, 3) uint8 arrays built once at import, for numeric consumers
+THEME_TO_PALETTE_NP = {k: _readonly(np.asarray(v, dtype=np.uint8)) for k, v in THEME_TO_PALETTE.items()}
+_DEFAULT_PALETTE_NP = _readonly(np.asarray(DEFAULT_PALETTE, dtype=np.uint8))
+
+# Substring fallback patterns, longest first so the most specific theme wins.
+# A dozen short keys don't warrant an Aho-Corasick automaton.
+_LOWER_KEYS = tuple(sorted(((k.lower(), k) for k in THEME_TO_PALETTE), key=lambda kv: -len(kv[0])))
+
+
+@lru_cache(maxsize=128)
+def _theme_key(theme: str) -> Optional[str]:
     key = theme.strip().lower()
     if key in THEME_TO_PALETTE:
-        return THEME_TO_PALETTE[key]
-    for k, v in THEME_TO_PALETTE.items():
-        if k.lower() in key:
-            return v
-    return [(40, 40, 40), (90, 90, 90), (160, 160, 160)]
+        return key
+    for lowered, k in _LOWER_KEYS:
+        if lowered in key:
+            return k
+    return None
+
+
+def palette_for_theme(theme: str) -> Palette:
+    k = _theme_key(theme)
+    return THEME_TO_PALETTE[k] if k is not None else DEFAULT_PALETTE
+
+
+def palette_for_theme_np(theme: str) -> np.ndarray:
+    """Read-only (n, 3) uint8 palette for `theme`"""
+    k = _theme_key(theme)
+    return THEME_TO_PALETTE_NP[k] if k is not None else _DEFAULT_PALETTE_NP
 
 
 def rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
@@ -41,23 +73,48 @@ def hex_to_rgb(h: str) -> Tuple[int, int, int]:
     return tuple(int(h[i : i + 2], 16) for i in (0, 2, 4))  # type: ignore
 
 
-def horizontal_gradient(size: Tuple[int, int], colors: Palette) -> Image.Image:
+_LUT_SIZE = 256
+
+
+@lru_cache(maxsize=32)
+def _palette_lut(palette_key: Tuple[Tuple[int, int, int], ...]) -> np.ndarray:
+    """(256, 3) uint8 table of the palette's left-to-right gradient"""
+    cols = np.asarray(palette_key, dtype=np.float64)
+    stops = np.arange(len(cols))
+    xs = np.linspace(0, max(1, len(cols) - 1), _LUT_SIZE)
+    lut = np.stack([np.interp(xs, stops, cols[:, c]) for c in range(3)], axis=1).astype(np.uint8)
+    return _readonly(lut)
+
+
+def horizontal_gradient(size: Tuple[int, int], colors: Union[Palette, np.ndarray]) -> Image.Image:
     width, height = size
-    img = Image.new("RGB", (width, height))
-    n = max(2, len(colors))
-    for x in range(width):
-        t = x / (width - 1 if width > 1 else 1)
-        pos = t * (n - 1)
-        i = int(pos)
-        f = pos - i
-        c0 = colors[min(i, n - 1)]
-        c1 = colors[min(i + 1, n - 1)]
-        r = int(c0[0] * (1 - f) + c1[0] * f)
-        g = int(c0[1] * (1 - f) + c1[1] * f)
-        b = int(c0[2] * (1 - f) + c1[2] * f)
-        for y in range(height):
-            img.putpixel((x, y), (r, g, b))
-    return img
+    palette_key = tuple(map(tuple, np.asarray(colors, dtype=np.int64).reshape(-1, 3).tolist()))
+    if len(set(palette_key)) <= 1:
+        # Solid backdrop: a single fill in C, no gradient to compute
+        return Image.new("RGB", size, palette_key[0] if palette_key else (0, 0, 0))
+    if width * height > _TEMPLATE_MAX_PIXELS:
+        # Too big to pin in the pool; build it for this call only
+        return _build_gradient((width, height), palette_key)
+    # Callers draw on the result, so hand out a copy of the pooled backdrop:
+    # one C memcpy instead of rebuilding and converting the pixels
+    return _gradient_template((width, height), palette_key).copy()
+
+
+# Only backdrops up to 720p are pooled (~2.7 MB each, ~44 MB for a full
+# pool); sizes come from request parameters, so larger ones aren't kept
+_TEMPLATE_MAX_PIXELS = 1280 * 720
 
 
+def _build_gradient(size: Tuple[int, int], palette_key: Tuple[Tuple[int, int, int], ...]) -> Image.Image:
+    width, height = size
+    lut = _palette_lut(palette_key)
+    idx = np.rint(np.linspace(0, _LUT_SIZE - 1, width)).astype(np.intp)
+    row = lut[idx]
+    arr = np.broadcast_to(row[None, :, :], (height, width, 3))
+    return Image.fromarray(np.ascontiguousarray(arr), "RGB")
+
 
+@lru_cache(maxsize=16)
+def _gradient_template(size: Tuple[int, int], palette_key: Tuple[Tuple[int, int, int], ...]) -> Image.Image:
+    """Shared gradient image for the common request sizes; never draw on it"""
+    return _build_gradient(size, palette_key)
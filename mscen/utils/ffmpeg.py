@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from functools import lru_cache
+from typing import Tuple
+
+
+def ffmpeg_exe() -> str:
+    exe = shutil.which("ffmpeg")
+    if exe:
+        return exe
+    try:
+        # Bundled with moviepy's imageio-ffmpeg dependency
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except ImportError:
+        raise RuntimeError("ffmpeg not found; install ffmpeg or imageio-ffmpeg")
+
+
+@lru_cache(maxsize=None)
+def h264_encoder_args() -> Tuple[str, ...]:
+    """Video codec args for H.264: NVENC if a GPU encoder actually opens, else libx264"""
+    # Listing h264_nvenc under -encoders doesn't mean a usable GPU is present,
+    # so probe with a tiny encode once per process
+    probe = [
+        ffmpeg_exe(), "-hide_banner", "-loglevel", "error",
+        "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+        "-c:v", "h264_nvenc", "-f", "null", "-",
+    ]
+    try:
+        nvenc = subprocess.run(probe, capture_output=True, timeout=30).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        nvenc = False
+    if nvenc:
+        return ("-c:v", "h264_nvenc", "-preset", "p4")
+    return ("-c:v", "libx264", "-preset", "veryfast", "-threads", "0")
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from collections import deque
+from typing import Deque
+
+_BATCH = 256
+
+_pool: Deque[str] = deque()
+_lock = threading.Lock()
+
+# A forked child must not hand out the ids its parent already holds
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_pool.clear)
+
+
+def _refill() -> None:
+    raw = os.urandom(16 * _BATCH)
+    _pool.extend(str(uuid.UUID(bytes=raw[i : i + 16], version=4)) for i in range(0, len(raw), 16))
+
+
+def next_uuid() -> str:
+    """Random UUID4 string, drawn from a pool filled by one urandom read per batch"""
+    while True:
+        try:
+            return _pool.popleft()
+        except IndexError:
+            with _lock:
+                if not _pool:
+                    _refill()
@@ -1,21 +1,50 @@
 from __future__ import annotations
 
+import subprocess
+import wave
 from pathlib import Path
 from typing import Optional
 
-from PIL import Image
-from moviepy.editor import ImageClip, AudioFileClip
+from .utils.ffmpeg import ffmpeg_exe, h264_encoder_args
+
+# This module shadows the mscen/video/ directory; exposing it as the search
+# path keeps mscen.video.professional_engine importable by name, which the
+# engine's spawned render workers need to unpickle it
+__path__ = [str(Path(__file__).with_suffix(""))]
+
+
+def _probe_duration(audio_path: Path) -> Optional[float]:
+    """Duration from the WAV header alone; None for other containers"""
+    try:
+        with wave.open(str(audio_path), "rb") as wf:
+            return wf.getnframes() / float(wf.getframerate())
+    except (wave.Error, EOFError, OSError):
+        return None
 
 
 def compose_image_music_to_mp4(image_path: Path, audio_path: Path, out_path: Path, fps: int = 30) -> Path:
-    img = Image.open(image_path).convert("RGB")
-    w, h = img.size
-    clip = ImageClip(str(image_path)).set_duration(AudioFileClip(str(audio_path)).duration)
-    clip = clip.set_fps(fps)
-    audio = AudioFileClip(str(audio_path))
-    clip = clip.set_audio(audio)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    clip.write_videofile(str(out_path), codec="libx264", audio_codec="aac", fps=fps, verbose=False, logger=None)
+    # Loop the still image and let -shortest end the video with the audio.
+    # NVENC when a GPU encoder opens; on libx264, -tune stillimage keeps the
+    # repeated frame nearly free to encode
+    video_args = list(h264_encoder_args())
+    if "libx264" in video_args:
+        video_args += ["-tune", "stillimage"]
+    cmd = [
+        ffmpeg_exe(), "-y", "-loglevel", "error",
+        "-loop", "1", "-framerate", str(fps), "-i", str(image_path),
+        "-i", str(audio_path),
+        *video_args, "-pix_fmt", "yuv420p",
+        # yuv420p needs even dimensions
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        "-c:a", "aac", "-b:a", "192k",
+        "-movflags", "+faststart",
+        "-shortest",
+    ]
+    duration = _probe_duration(audio_path)
+    if duration is not None:
+        # -shortest can overshoot by a muxer buffer; pin the exact length when known
+        cmd += ["-t", f"{duration:.3f}"]
+    cmd.append(str(out_path))
+    subprocess.run(cmd, check=True)
     return out_path
-
-
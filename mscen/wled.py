@@ -2,21 +2,28 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import List, Dict, Any
-import json
+
+import numpy as np
+
+from .core import _json
 
 
 def frames_to_wled_preset(frames: List[Dict[str, int]]) -> Dict[str, Any]:
     # 简化的 WLED 状态序列，逐帧设置颜色与过渡时间（tt）
-    sequence = []
-    for f in frames:
-        r, g, b, ms = f["r"], f["g"], f["b"], f["ms"]
-        state = {
+    if not frames:
+        return {"sequence": []}
+    # 亮度一次性向量化计算，再逐帧组装状态
+    rgb = np.array([(f["r"], f["g"], f["b"]) for f in frames], dtype=np.float64)
+    bri = np.maximum(1, (0.3 * 255 + 0.7 * rgb.max(axis=1)).astype(np.int64)).tolist()
+    sequence = [
+        {
             "on": True,
-            "bri": max(1, int(0.3 * 255 + 0.7 * max(r, g, b))),
-            "tt": int(ms),
-            "seg": [{"id": 0, "col": [[r, g, b]]}],
+            "bri": b,
+            "tt": int(f["ms"]),
+            "seg": [{"id": 0, "col": [[f["r"], f["g"], f["b"]]]}],
         }
-        sequence.append(state)
+        for f, b in zip(frames, bri)
+    ]
     return {"sequence": sequence}
 
 
@@ -24,8 +31,5 @@ def save_wled_preset(frames: List[Dict[str, int]], out_dir: Path, filename: str
     out_dir.mkdir(parents=True, exist_ok=True)
     path = out_dir / filename
     data = frames_to_wled_preset(frames)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    path.write_bytes(_json.dumps(data, indent=True))
     return path
-
-
@@ -6,8 +6,12 @@ This script generates impressive demo content to showcase the project's capabili
 Run this to create example outputs for README and documentation.
 """
 
+import json
 import os
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
 # Add project root to path
@@ -19,6 +23,61 @@ from mscen.lighting import generate_lighting_program
 from mscen.video import compose_image_music_to_mp4
 
 
+def _run_one_theme(i, theme, demo_dir):
+    """Generate the image, music, lighting and video of one demo theme.
+
+    Module-level so it can run in a worker process; returns None on failure.
+    """
+    
+    print(f"\n🎨 Creating Demo {i}/4: {theme['name']}")
+    print(f"Theme: {theme['description']}")
+    
+    try:
+        # Generate image
+        print("  📸 Generating image...")
+        image = generate_scene_image(theme["prompt"])
+        image_path = demo_dir / f"{theme['name']}_image.png"
+        image.save(image_path)
+        
+        # Generate music
+        print("  🎵 Generating music...")
+        music_path = generate_music_for_theme(theme["prompt"], duration=30)
+        demo_music_path = demo_dir / f"{theme['name']}_music.wav"
+        if music_path and music_path.exists():
+            shutil.copy2(music_path, demo_music_path)
+        
+        # Generate lighting
+        print("  💡 Generating lighting...")
+        lighting_program = generate_lighting_program(theme["prompt"])
+        lighting_path = demo_dir / f"{theme['name']}_lighting.json"
+        
+        with open(lighting_path, 'w') as f:
+            json.dump(lighting_program, f, indent=2)
+        
+        # Generate video (if both image and music exist)
+        print("  🎬 Generating video...")
+        if demo_music_path.exists():
+            video_path = compose_image_music_to_mp4(
+                str(image_path), 
+                str(demo_music_path), 
+                str(demo_dir / f"{theme['name']}_video.mp4")
+            )
+        
+        print(f"  ✅ Demo {i} completed!")
+        
+        return {
+            "theme": theme,
+            "image": image_path,
+            "music": demo_music_path if demo_music_path.exists() else None,
+            "lighting": lighting_path,
+            "video": demo_dir / f"{theme['name']}_video.mp4"
+        }
+        
+    except Exception as e:
+        print(f"  ❌ Error in demo {i}: {e}")
+        return None
+
+
 def create_demo_content():
     """Generate impressive demo content for GitHub showcase."""
     
@@ -53,58 +112,17 @@ def create_demo_content():
         }
     ]
     
-    results = []
-    
-    for i, theme in enumerate(demo_themes, 1):
-        print(f"\n🎨 Creating Demo {i}/4: {theme['name']}")
-        print(f"Theme: {theme['description']}")
-        
-        try:
-            # Generate image
-            print("  📸 Generating image...")
-            image = generate_scene_image(theme["prompt"])
-            image_path = demo_dir / f"{theme['name']}_image.png"
-            image.save(image_path)
-            
-            # Generate music
-            print("  🎵 Generating music...")
-            music_path = generate_music_for_theme(theme["prompt"], duration=30)
-            demo_music_path = demo_dir / f"{theme['name']}_music.wav"
-            if music_path and music_path.exists():
-                import shutil
-                shutil.copy2(music_path, demo_music_path)
-            
-            # Generate lighting
-            print("  💡 Generating lighting...")
-            lighting_program = generate_lighting_program(theme["prompt"])
-            lighting_path = demo_dir / f"{theme['name']}_lighting.json"
-            
-            import json
-            with open(lighting_path, 'w') as f:
-                json.dump(lighting_program, f, indent=2)
-            
-            # Generate video (if both image and music exist)
-            print("  🎬 Generating video...")
-            if demo_music_path.exists():
-                video_path = compose_image_music_to_mp4(
-                    str(image_path), 
-                    str(demo_music_path), 
-                    str(demo_dir / f"{theme['name']}_video.mp4")
-                )
-            
-            results.append({
-                "theme": theme,
-                "image": image_path,
-                "music": demo_music_path if demo_music_path.exists() else None,
-                "lighting": lighting_path,
-                "video": demo_dir / f"{theme['name']}_video.mp4"
-            })
-            
-            print(f"  ✅ Demo {i} completed!")
-            
-        except Exception as e:
-            print(f"  ❌ Error in demo {i}: {e}")
-            continue
+    # Themes are independent, so generate them side by side; set DEMO_WORKERS=1
+    # to run them one at a time (e.g. when they share a single GPU)
+    workers = int(os.environ.get("DEMO_WORKERS", min(len(demo_themes), os.cpu_count() or 1)))
+    if workers <= 1:
+        results = [_run_one_theme(i, theme, demo_dir) for i, theme in enumerate(demo_themes, 1)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_run_one_theme, i, theme, demo_dir) for i, theme in enumerate(demo_themes, 1)]
+            # Collect in theme order so the showcase doesn't depend on which finishes first
+            results = [fut.result() for fut in futures]
+    results = [r for r in results if r]
     
     # Generate demo showcase HTML
     create_demo_showcase(results, demo_dir)
@@ -296,9 +314,6 @@ def create_demo_showcase(results, demo_dir):
 def create_demo_stats(results, demo_dir):
     """Create a statistics file for the demo."""
     
-    import json
-    from datetime import datetime
-    
     stats = {
         "generated_at": datetime.now().isoformat(),
         "total_themes": len(results),
@@ -1,10 +1,17 @@
+import argparse
+import multiprocessing
 import os
 from pathlib import Path
 
+# resvg (Rust) parses and rasterizes natively; cairosvg is the fallback
 try:
-    from cairosvg import svg2png
-except Exception as e:
-    raise SystemExit("Please install cairosvg: pip install cairosvg")
+    import resvg_py
+except ImportError:
+    resvg_py = None
+    try:
+        from cairosvg import svg2png
+    except Exception as e:
+        raise SystemExit("Please install resvg-py (or cairosvg): pip install resvg-py")
 
 ROOT = Path(__file__).resolve().parents[1]
 FRONT_PUBLIC = ROOT / 'frontend' / 'public'
@@ -22,14 +29,39 @@ def ensure_dirs():
     for _, out_path, _, _ in TASKS:
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
-def convert_all():
+def _convert_one(task):
+    src, dst, w, h = task
+    if not src.exists():
+        return f"[WARN] missing: {src}"
+    if resvg_py is not None:
+        png = resvg_py.svg_to_bytes(svg_path=str(src), resources_dir=str(src.parent), width=w, height=h)
+        dst.write_bytes(bytes(png))
+    else:
+        svg2png(url=str(src), write_to=str(dst), output_width=w, output_height=h)
+    return f"[GEN] {dst} ({w}x{h}) from {src}"
+
+def _up_to_date(src, dst):
+    return src.exists() and dst.exists() and dst.stat().st_mtime >= src.stat().st_mtime
+
+def convert_all(force=False):
+    # Create the output dirs up front so the workers don't race on mkdir
     ensure_dirs()
-    for src, dst, w, h in TASKS:
-        if not src.exists():
-            print(f"[WARN] missing: {src}")
+    todo = []
+    for task in TASKS:
+        src, dst = task[:2]
+        if not force and _up_to_date(src, dst):
+            print(f"[SKIP] {dst} up-to-date")
             continue
-        print(f"[GEN] {dst} ({w}x{h}) from {src}")
-        svg2png(url=str(src), write_to=str(dst), output_width=w, output_height=h)
+        todo.append(task)
+    if not todo:
+        return
+    # Each conversion is independent and CPU-bound (SVG parsing holds the GIL),
+    # so rasterize them in separate processes
+    with multiprocessing.Pool(min(len(todo), os.cpu_count() or 1)) as pool:
+        for msg in pool.imap_unordered(_convert_one, todo):
+            print(msg)
 
 if __name__ == '__main__':
-    convert_all() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Export the project SVGs to PNG")
+    parser.add_argument('--force', action='store_true', help="re-render even if the PNG is newer than its SVG")
+    convert_all(force=parser.parse_args().force) 
\ No newline at end of file
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 # Minimal MCP-like scaffold via FastAPI exposing tools endpoints
+import asyncio
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
@@ -21,18 +26,50 @@ OUT = BASE_DIR / "outputs"
 OUT.mkdir(parents=True, exist_ok=True)
 
 
+def _tag(*parts) -> str:
+    """Short hex tag for output file names, stable across restarts (hash() is salted per process)"""
+    h = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
 class Txt2ImgReq(BaseModel):
     prompt: str
     width: int = 896
     height: int = 512
 
 
+def _scene_image(prompt: str, width: int, height: int) -> Tuple[Path, bool]:
+    """(path, cached): same prompt and size render the same image, so reuse it"""
+    path = OUT / f"mcp_img_{_tag(prompt, width, height)}.png"
+    if path.exists():
+        return path, True
+    img = generate_scene_image(prompt, size=(width, height))
+    # Write to a private temp file and os.replace it in, so the exists() check
+    # above never sees a half-written PNG from a concurrent request
+    fd, tmp = tempfile.mkstemp(dir=OUT, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            img.save(f, format="PNG")
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path, False
+
+
+def _result(path: Path, cached: bool, **extra) -> dict:
+    body = {"ok": True, "path": str(path), **extra}
+    if cached:
+        body["cached"] = True
+    return body
+
+
 @app.post("/tools/txt2img")
 def tool_txt2img(req: Txt2ImgReq):
-    img = generate_scene_image(req.prompt, size=(req.width, req.height))
-    path = OUT / f"mcp_img_{abs(hash(req.prompt)) % 10**8}.png"
-    img.save(path)
-    return JSONResponse({"ok": True, "path": str(path)})
+    return JSONResponse(_result(*_scene_image(req.prompt, req.width, req.height)))
 
 
 class MusicReq(BaseModel):
@@ -50,17 +87,28 @@ class LightingReq(BaseModel):
     prompt: str
 
 
+@lru_cache(maxsize=128)
+def _cached_frames(prompt: str) -> tuple:
+    # Frozen as item tuples: the cache must not hand out dicts a caller could mutate
+    return tuple(tuple(frame.items()) for frame in generate_lighting_from_theme(prompt))
+
+
+def _lighting_frames(prompt: str) -> list:
+    """Lighting frames for `prompt`, shared between /tools/lighting, /tools/wled and /tools/pack"""
+    return [dict(frame) for frame in _cached_frames(prompt)]
+
+
 @app.post("/tools/lighting")
 def tool_lighting(req: LightingReq):
-    frames = generate_lighting_from_theme(req.prompt)
-    path = save_lighting_program(frames, OUT, filename=f"mcp_lighting_{abs(hash(req.prompt)) % 10**8}.json")
+    frames = _lighting_frames(req.prompt)
+    path = save_lighting_program(frames, OUT, filename=f"mcp_lighting_{_tag(req.prompt)}.json")
     return JSONResponse({"ok": True, "frames": frames, "path": str(path)})
 
 
 @app.post("/tools/wled")
 def tool_wled(req: LightingReq):
-    frames = generate_lighting_from_theme(req.prompt)
-    path = save_wled_preset(frames, OUT, filename=f"mcp_wled_{abs(hash(req.prompt)) % 10**8}.json")
+    frames = _lighting_frames(req.prompt)
+    path = save_wled_preset(frames, OUT, filename=f"mcp_wled_{_tag(req.prompt)}.json")
     return JSONResponse({"ok": True, "path": str(path)})
 
 
@@ -70,11 +118,52 @@ class VideoReq(BaseModel):
     fps: int = 30
 
 
+def _video(image_path: Path, audio_path: Path, fps: int) -> Tuple[Path, bool]:
+    """(path, cached) of the MP4 for these inputs"""
+    # Key on the inputs' size and mtime too, so an overwritten input isn't served stale
+    stats = [(p.stat().st_size, p.stat().st_mtime_ns) if p.exists() else None for p in (image_path, audio_path)]
+    out_path = OUT / f"mcp_video_{_tag(image_path, audio_path, fps, *stats)}.mp4"
+    if out_path.exists():
+        return out_path, True
+    return compose_image_music_to_mp4(image_path, audio_path, out_path, fps=fps), False
+
+
 @app.post("/tools/video")
 def tool_video(req: VideoReq):
-    out_path = OUT / f"mcp_video_{abs(hash((req.image_path, req.audio_path))) % 10**8}.mp4"
-    result_path = compose_image_music_to_mp4(Path(req.image_path), Path(req.audio_path), out_path, fps=req.fps)
-    return JSONResponse({"ok": True, "path": str(result_path)})
+    return JSONResponse(_result(*_video(Path(req.image_path), Path(req.audio_path), req.fps)))
+
+
+class PackReq(BaseModel):
+    prompt: str
+    duration: float = 20.0
+    width: int = 896
+    height: int = 512
+    fps: int = 30
+
+
+@app.post("/tools/pack")
+async def tool_pack(req: PackReq):
+    """Image, music, lighting, WLED preset and video for one prompt in one call"""
+    # The three generators are independent; overlap them on worker threads
+    (img_path, img_cached), music_path, frames = await asyncio.gather(
+        asyncio.to_thread(_scene_image, req.prompt, req.width, req.height),
+        asyncio.to_thread(generate_music_from_theme, req.prompt, duration_s=float(req.duration), out_dir=OUT),
+        asyncio.to_thread(_lighting_frames, req.prompt),
+    )
+    # One set of lighting frames feeds both the program and the WLED preset
+    lighting_path, wled_path = await asyncio.gather(
+        asyncio.to_thread(save_lighting_program, frames, OUT, filename=f"mcp_lighting_{_tag(req.prompt)}.json"),
+        asyncio.to_thread(save_wled_preset, frames, OUT, filename=f"mcp_wled_{_tag(req.prompt)}.json"),
+    )
+    video_path, video_cached = await asyncio.to_thread(_video, img_path, music_path, req.fps)
+    return JSONResponse({
+        "ok": True,
+        "image": _result(img_path, img_cached),
+        "music": _result(music_path, False),
+        "lighting": _result(lighting_path, False, frames=frames),
+        "wled": _result(wled_path, False),
+        "video": _result(video_path, video_cached),
+    })
 
 
 class TTSReq(BaseModel):
@@ -85,7 +174,7 @@ class TTSReq(BaseModel):
 @app.post("/tools/voice_tts")
 def tool_voice_tts(req: TTSReq):
     # Mock TTS - returns path to generated audio
-    out_path = OUT / f"mcp_tts_{abs(hash(req.text)) % 10**8}.mp3"
+    out_path = OUT / f"mcp_tts_{_tag(req.text, req.voice)}.mp3"
     # In real implementation, call TTS and save to out_path
     out_path.write_text(f"TTS placeholder for: {req.text}")
     return JSONResponse({"ok": True, "path": str(out_path), "text": req.text})
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import tempfile
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.responses import Response
 
 from PIL import Image
+from scipy.io import wavfile
 
 from mscen.image_gen import generate_scene_image
 from mscen.music_gen import generate_music_from_theme
@@ -21,16 +26,24 @@ async def txt2img(prompt: str, seed: Optional[int] = None, width: int = 896, hei
     img = generate_scene_image(prompt, size=(width, height), seed=seed)
     buf = BytesIO()
     img.save(buf, format="PNG")
+    # Starlette's Response only passes bytes through unchanged (anything else
+    # gets .encode()d), so hand it getvalue() rather than a getbuffer() view
     return Response(content=buf.getvalue(), media_type="image/png")
 
 
+def _render_music(prompt: str, duration: float) -> bytes:
+    # 每个请求写入独立的临时目录：相同 prompt/duration 的并发请求
+    # 不会互相截断或覆盖同一个 /tmp/music_<tag>.wav
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = generate_music_from_theme(prompt, duration_s=duration, out_dir=Path(tmp))
+        return wav_path.read_bytes()
+
+
 @app.post("/musicgen")
 async def musicgen(prompt: str, duration: float = 20.0, style: Optional[str] = None):
-    tmp = Path("/tmp")
-    tmp.mkdir(parents=True, exist_ok=True)
-    out_path = tmp / "mock_music.wav"
-    wav_path = generate_music_from_theme(prompt, duration_s=duration, out_dir=tmp)
-    return Response(content=wav_path.read_bytes(), media_type="audio/wav")
+    # Synthesis, the WAV write and the read-back are blocking; keep them off the event loop
+    data = await asyncio.to_thread(_render_music, prompt, duration)
+    return Response(content=data, media_type="audio/wav")
 
 
 @app.post("/stt")
@@ -39,19 +52,18 @@ async def stt(file: UploadFile = File(...), language: Optional[str] = Form(None)
     return {"text": "这是一个语音转写示例。"}
 
 
-@app.post("/tts")
-async def tts(text: str, voice: Optional[str] = None):
-    # 生成 1 秒 440Hz 正弦波作为占位
-    import numpy as np
-    from scipy.io import wavfile
+@lru_cache(maxsize=None)
+def _placeholder_wav() -> bytes:
+    # 生成 1 秒 440Hz 正弦波作为占位；内容与请求无关，只算一次
     sr = 22050
     t = np.arange(int(sr * 1.0)) / sr
     audio = (0.2 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    # 直接写入内存，不经过临时文件
     buf = BytesIO()
-    import tempfile
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-        wavfile.write(f.name, sr, (audio * 32767).astype('int16'))
-        data = Path(f.name).read_bytes()
-    return Response(content=data, media_type="audio/wav")
+    wavfile.write(buf, sr, (audio * 32767).astype('int16'))
+    return buf.getvalue()
 
 
+@app.post("/tts")
+async def tts(text: str, voice: Optional[str] = None):
+    return Response(content=_placeholder_wav(), media_type="audio/wav")
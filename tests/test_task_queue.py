@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from mscen.tasks.queue import TaskQueue, TaskStatus
+
+
+def _records(queue: TaskQueue) -> int:
+    return sum(1 for line in queue.state_file.read_bytes().splitlines() if line.strip())
+
+
+def test_log_replays_to_same_state_after_compaction(tmp_path: Path) -> None:
+    queue = TaskQueue(tmp_path)
+    first = queue.submit("txt2all", {"prompt": "zen"})
+    second = queue.submit("img2music", {"prompt": "party"})
+    # Enough updates to cross COMPACT_FACTOR records per task at least once
+    for i in range(1, 10):
+        queue.update(first.id, status=TaskStatus.RUNNING, progress=i / 10)
+    queue.update(second.id, status=TaskStatus.FAILED, error="boom")
+
+    assert _records(queue) <= TaskQueue.COMPACT_FACTOR * len(queue.tasks)
+
+    reloaded = TaskQueue(tmp_path)
+    assert reloaded.get(first.id) == queue.get(first.id)
+    assert reloaded.get(first.id).progress == 0.9
+    assert reloaded.get(second.id).status is TaskStatus.FAILED
+    assert reloaded.get(second.id).error == "boom"
+
+
+def test_refresh_picks_up_other_instances_appends(tmp_path: Path) -> None:
+    reader = TaskQueue(tmp_path)
+    writer = TaskQueue(tmp_path)
+    task = writer.submit("txt2all", {"prompt": "sleep"})
+    writer.update(task.id, status=TaskStatus.RUNNING)
+    writer.compact()
+
+    reader.refresh()
+    assert [t.id for t in reader.list()] == [task.id]
+    assert reader.get(task.id).status is TaskStatus.RUNNING
+
+
+def test_loads_legacy_string_statuses(tmp_path: Path) -> None:
+    # Logs written before TaskStatus became an IntEnum store the status name
+    log = tmp_path / "tasks" / "queue.jsonl"
+    log.parent.mkdir(parents=True)
+    log.write_text(
+        '{"id": "a", "kind": "txt2all", "params": {}, "status": "pending", "progress": 0.0, "error": null}\n'
+        '{"id": "b", "kind": "txt2all", "params": {}, "status": "running", "progress": 0.5, "error": null}\n'
+        '{"id": "a", "kind": "txt2all", "params": {}, "status": "completed", "progress": 1.0, "error": null}\n'
+        '{"id": "c", "kind": "txt2all", "params": {}, "status": 3, "progress": 0.2, "error": "x"}\n',
+        encoding="utf-8",
+    )
+
+    queue = TaskQueue(tmp_path)
+    assert queue.get("a").status is TaskStatus.COMPLETED
+    assert queue.get("b").status is TaskStatus.RUNNING
+    assert queue.get("c").status is TaskStatus.FAILED
+    assert queue.get("b").status.label == "running"
+
+    # Migrated tasks keep working with the status checks in pause/resume
+    queue.pause("b")
+    queue.resume("c")
+    reloaded = TaskQueue(tmp_path)
+    assert reloaded.get("b").status is TaskStatus.PAUSED
+    assert reloaded.get("c").status is TaskStatus.PENDING
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+
+from mscen.core import _json
+from mscen.personalization.user_profile import PersonalizationEngine
+
+
+@pytest.fixture
+def engine(tmp_path: Path):
+    engine = PersonalizationEngine(tmp_path)
+    # Keep the background flusher out of the way; tests flush explicitly
+    engine.FLUSH_INTERVAL = 3600
+    yield engine
+    engine.close()
+
+
+def test_dirty_profiles_survive_a_failed_write(engine: PersonalizationEngine, tmp_path: Path,
+                                               monkeypatch: pytest.MonkeyPatch) -> None:
+    engine.learn_from_interaction("alice", {"theme": "zen"})
+    engine.learn_from_interaction("bob", {"theme": "party"})
+
+    write_profile = engine._write_profile
+
+    def failing_for_alice(user_id: str) -> None:
+        if user_id == "alice":
+            raise OSError("disk full")
+        write_profile(user_id)
+
+    monkeypatch.setattr(engine, "_write_profile", failing_for_alice)
+    with pytest.raises(OSError):
+        engine.flush()
+    # The failure doesn't stop the other pending profiles from being written
+    assert (tmp_path / "bob.json").exists()
+    assert not (tmp_path / "alice.json").exists()
+
+    monkeypatch.setattr(engine, "_write_profile", write_profile)
+    engine.flush()
+    data = _json.loads((tmp_path / "alice.json").read_bytes())
+    assert data["usage_stats"]["favorite_themes"] == ["zen"]
+
+
+def test_close_flushes_and_reloads(tmp_path: Path) -> None:
+    engine = PersonalizationEngine(tmp_path)
+    engine.update_preference("carol", "theme", "sleep")
+    engine.update_profile("carol", preferred_speed="fast")
+    engine.close()
+
+    reloaded = PersonalizationEngine(tmp_path)
+    profile = reloaded.get_or_create_profile("carol")
+    assert profile.preferred_speed == "fast"
+    assert [(p.category, p.value) for p in profile.preferences] == [("theme", "sleep")]
+    reloaded.close()
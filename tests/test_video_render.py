@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from mscen.core.cache import SimpleDiskCache
+from mscen.core.logger import JsonlLogger
+from mscen.video.professional_engine import ProfessionalVideoEngine
+
+
+def _tiny_project(engine: ProfessionalVideoEngine):
+    project = engine.create_video_project("tiny", fps=10, resolution=(64, 36))
+    base = engine.add_track(project, "base")
+    overlay = engine.add_track(project, "overlay")
+    rng = np.random.default_rng(0)
+    images = [Image.fromarray(rng.integers(0, 256, (36, 64, 3), dtype=np.uint8)) for _ in range(3)]
+
+    first = engine.add_image_clip(project, base, images[0], 1.5, 0.0)
+    second = engine.add_image_clip(project, base, images[1], 1.5, 1.5)
+    top = engine.add_image_clip(project, overlay, images[2].convert("RGBA"), 2.0, 0.5)
+    engine.add_effect_to_clip(project, first, "fade_in", {"duration": 0.5})
+    engine.add_effect_to_clip(project, first, "color_shift", {})
+    engine.add_effect_to_clip(project, second, "pixelate", {"max_pixel_size": 6})
+    engine.add_transition(project, base, "crossfade", 0.3, (first, second))
+    engine.add_effect_to_clip(project, top, "zoom_in", {})
+    project["tracks"][1].opacity = 0.5
+    return project
+
+
+def test_pool_render_matches_in_process(tmp_path: Path) -> None:
+    engine = ProfessionalVideoEngine(SimpleDiskCache(tmp_path / "cache"), JsonlLogger(tmp_path, "video"))
+    # Small chunks so two workers each render several ranges
+    engine.RENDER_CHUNK_FRAMES = 4
+    project = _tiny_project(engine)
+    total_frames = int(project["metadata"]["total_duration"] * project["fps"])
+
+    serial = [frame.copy() for frame in engine._iter_frames(project, total_frames)]
+    pooled = [frame.copy() for frame in engine._iter_frames(project, total_frames, workers=2)]
+
+    assert len(serial) == len(pooled) == total_frames
+    for idx, (a, b) in enumerate(zip(serial, pooled)):
+        assert np.array_equal(a, b), f"frame {idx} differs"